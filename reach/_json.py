@@ -0,0 +1,77 @@
+"""
+JSON files
+==========
+
+Reading and writing of training data files.
+
+Training JSON files are parsed and serialised with orjson when it is installed, which
+is considerably faster than the standard library for large training histories. If it
+is not available the standard library's json module is used instead.
+"""
+
+import json
+import re
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson reads integers beyond 64 bits as floats rather than failing, so files with long
+# runs of digits that could hold them are left to json.
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+def read_json(data_file):
+    """
+    Load the contents of a JSON file.
+
+    Parameters
+    ----------
+    data_file : :class:`str`
+        Full path to the JSON file.
+
+    """
+    # Read the raw bytes in one go; the buffer is sized from the file's metadata.
+    contents = Path(data_file).read_bytes()
+
+    if orjson is not None and not _LONG_DIGITS.search(contents):
+        try:
+            return orjson.loads(contents)
+        except orjson.JSONDecodeError:
+            # json writes NaN and Infinity, which orjson will not read
+            pass
+    return json.loads(contents)
+
+
+def write_json(data_file, data):
+    """
+    Write data to a JSON file, replacing any existing contents.
+
+    Parameters
+    ----------
+    data_file : :class:`str`
+        Full path to the JSON file.
+
+    data : :class:`list` or :class:`dict`
+        JSON-serialisable data to write.
+
+    """
+    contents = None
+    if orjson is not None:
+        try:
+            contents = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects some data that json accepts, such as integers over 64 bits
+            pass
+        else:
+            if b"null" in contents:
+                # orjson writes NaN and infinite values as null, so let json tell them
+                # apart from None
+                contents = None
+    if contents is None:
+        contents = json.dumps(data).encode()
+
+    with open(data_file, "wb") as fd:
+        fd.write(contents)
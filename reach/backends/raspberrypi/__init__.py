@@ -1,8 +1,20 @@
+from typing import TYPE_CHECKING
+
 from .raspberry import Pins, RaspberryPi
-from .utilities import Utilities
+
+if TYPE_CHECKING:
+    from .utilities import Utilities
 
 __all__ = (
     "Pins",
     "RaspberryPi",
     "Utilities",
 )
+
+
+def __getattr__(name):
+    # Utilities depends on readchar, so only import it when it is actually used.
+    if name == "Utilities":
+        from .utilities import Utilities  # pylint: disable=import-outside-toplevel
+        return Utilities
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
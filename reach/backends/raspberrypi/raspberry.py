@@ -14,6 +14,9 @@ from reach.session import Targets
 from reach.backends import Backend
 from reach.backends.raspberrypi import spouts
 
+# The pin numbering mode is process-wide, so it is set on import rather than for each
+# RaspberryPi instance. Backends only clean up their own pins, which leaves it in place,
+# but instances set it again if a full GPIO.cleanup() elsewhere has reset it.
 GPIO.setwarnings(False)
 GPIO.setmode(GPIO.BCM)
 
@@ -59,6 +62,8 @@ class RaspberryPi(Backend):
         pin_numbers=None,
     ):
         Backend.__init__(self)
+        if GPIO.getmode() is None:
+            GPIO.setmode(GPIO.BCM)
         self._reward_duration = reward_duration or 0.070
         self._is_trial = False
         self._current_target_spout = Targets.LEFT
@@ -71,17 +76,27 @@ class RaspberryPi(Backend):
         self._paw_pins = pin_numbers.paw_sensors
         if self._paw_pins:
             GPIO.setup(self._paw_pins, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        self._paw_index = {pin: i for i, pin in enumerate(self._paw_pins or ())}
 
-        self._target_pins = [x["touch"] for x in pin_numbers.spouts]
         self.spouts = [
             spouts.Spout(pin_numbers.spouts[Targets.LEFT]),
             spouts.Spout(pin_numbers.spouts[Targets.RIGHT]),
         ]
+        self._touch_index = {spout.touch_pin: i for i, spout in enumerate(self.spouts)}
 
         self._sync_signal = getattr(pin_numbers, "sync_signal", False)
         if self._sync_signal:
             GPIO.setup(self._sync_signal, GPIO.OUT, initial=False)
 
+        # Outputs that are switched on at the start of a trial for each target spout,
+        # and all outputs that are switched off together at the end of each trial
+        self._cue_pins = [[spout.cue_pin] for spout in self.spouts]
+        self._trial_pins = [spout.cue_pin for spout in self.spouts]
+        if self._sync_signal:
+            for pins in self._cue_pins:
+                pins.append(self._sync_signal)
+            self._trial_pins.append(self._sync_signal)
+
     def configure_callbacks(self, session):
         """
         Store session to later get session methods that will be executed in GPIO
@@ -96,6 +111,9 @@ class RaspberryPi(Backend):
         """
         input("Press enter to begin.\n")
 
+        # RPi.GPIO watches all of these pins from one polling thread and runs the
+        # callbacks on it in the order the edges arrive, so no further dispatching is
+        # needed here.
         if self._paw_pins:
             for pin in self._paw_pins:
                 GPIO.add_event_detect(
@@ -114,7 +132,7 @@ class RaspberryPi(Backend):
         """
         Callback function assigned to paw sesnsors by GPIO.add_event_detect.
         """
-        paw = self._paw_pins.index(pin)
+        paw = self._paw_index[pin]
         if self._is_trial:
             self.session.on_trial_lift(paw)
         else:
@@ -124,11 +142,7 @@ class RaspberryPi(Backend):
         """
         Callback function assigned to spout sensors by GPIO.add_event_detect.
         """
-        if pin == self.spouts[Targets.LEFT].touch_pin:
-            spout = Targets.LEFT
-        else:
-            spout = Targets.RIGHT
-
+        spout = self._touch_index[pin]
         if self._is_trial:
             if self._current_target_spout == spout:
                 self.session.on_trial_correct()
@@ -167,7 +181,7 @@ class RaspberryPi(Backend):
 
         print("Waiting for rest... ")
         try:
-            while not all([GPIO.input(pin) for pin in self._paw_pins]):
+            while not all(GPIO.input(pin) for pin in self._paw_pins):
                 time.sleep(0.010)
                 if self._finish:
                     return False
@@ -182,11 +196,8 @@ class RaspberryPi(Backend):
         Change state to trial.
         """
         self._is_trial = True
-        GPIO.output(self.spouts[spout_number].cue_pin, True)
+        GPIO.output(self._cue_pins[spout_number], True)
         self._current_target_spout = spout_number
-        if self._sync_signal:
-            GPIO.output(self._sync_signal, True)
-        print("Cue illuminated")
 
     def give_reward(self, spout_number):
         """
@@ -201,10 +212,7 @@ class RaspberryPi(Backend):
         Disable target spout LEDs.
         """
         self._is_trial = False
-        for spout in self.spouts:
-            GPIO.output(spout.cue_pin, False)
-        if self._sync_signal:
-            GPIO.output(self._sync_signal, False)
+        GPIO.output(self._trial_pins, False)
 
     def cleanup(self):
         """
@@ -224,5 +232,15 @@ class RaspberryPi(Backend):
         Cleanup only upon garbage-collection to prevent GPIO mode runtime errors in the
         event that callback functions still operate on GPIO pins after self.cleanup
         (though ideally this should never happen).
+
+        The actuator pins are left out, as their PWM objects are pooled for later
+        backends and released when the interpreter exits.
         """
-        GPIO.cleanup()
+        channels = [
+            pin for spout in self.spouts
+            for pin in (spout.cue_pin, spout.touch_pin, spout.reward_pin)
+        ]
+        channels.extend(self._paw_pins or ())
+        if self._sync_signal:
+            channels.append(self._sync_signal)
+        GPIO.cleanup(channels)
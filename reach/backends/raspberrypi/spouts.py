@@ -13,18 +13,54 @@ under one Spout class.
 """
 
 
+import atexit
 import threading
 import time
 import RPi.GPIO as GPIO  # pylint: disable=import-error
 
 
+# PWM objects are shared by all actuators driving the same pin, rather than being
+# recreated for every session. Backends leave these pins alone when they are cleaned up,
+# and they are stopped and released when the interpreter exits.
+_PWM_POOL = {}
+
+
+def _get_pwm(pin):
+    """
+    Get the running PWM object for a pin, creating and starting it if needed.
+    """
+    pwm = _PWM_POOL.get(pin)
+    if pwm is None:
+        pwm = GPIO.PWM(pin, 50)
+        pwm.start(0)
+        _PWM_POOL[pin] = pwm
+    else:
+        pwm.ChangeDutyCycle(0)
+    return pwm
+
+
+@atexit.register
+def _release_pwms():
+    """
+    Stop all pooled PWM objects and clean up their pins.
+    """
+    for pwm in _PWM_POOL.values():
+        pwm.stop()
+    if _PWM_POOL:
+        GPIO.cleanup(list(_PWM_POOL))
+    _PWM_POOL.clear()
+
+
 class Actuonix_PG12_P:
     """
     Actuonix PQ12-P Linear Actuator (20mm stroke, 63:1 ratio, 6V)
 
-    These duty cycles produce 1 mm intervals in position.
+    These duty cycles produce 1 mm intervals in position, and all lie within the
+    actuator's safe range of 7.2 to 9.5.
     """
 
+    __slots__ = ("_pin", "_pin2", "_pwm", "_duty_cycle", "_disable_thread")
+
     _DUTY_CYCLES = (
         7.2,
         7.7,
@@ -39,9 +75,8 @@ class Actuonix_PG12_P:
         self._pin = pin
         self._pin2 = pin2
         GPIO.setup(pin, GPIO.OUT, initial=False)
-        self._pwm = GPIO.PWM(pin, 50)
+        self._pwm = _get_pwm(pin)
         self._duty_cycle = 0
-        self._pwm.start(self._duty_cycle)
         self._disable_thread = None
 
     def set_position(self, position):
@@ -49,11 +84,9 @@ class Actuonix_PG12_P:
         Move the actuator to a determined position.
         """
         duty_cycle = Actuonix_PG12_P._DUTY_CYCLES[position - 1]
-        if not duty_cycle == 0:
-            if duty_cycle > 9.5:
-                duty_cycle = 9.5
-            elif duty_cycle < 7.2:
-                duty_cycle = 7.2
+        if duty_cycle == self._duty_cycle:
+            # Already there: the actuator holds its position while unpowered.
+            return
 
         if self._disable_thread and self._disable_thread.isAlive():
             time.sleep(1)
@@ -81,6 +114,8 @@ class Spout:
 
     """
 
+    __slots__ = ("cue_pin", "touch_pin", "reward_pin", "actuator_pin", "_actuator")
+
     def __init__(self, pins):
         self.cue_pin = pins["cue"]
         self.touch_pin = pins["touch"]
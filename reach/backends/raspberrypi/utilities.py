@@ -41,13 +41,14 @@ class Utilities(RaspberryPi):
         print("Testing all touch sensors.")
 
         spout_pins = [i.touch_pin for i in self.spouts]
-
-        def _print_touch(pin):
-            if pin in self._paw_pins:
-                index = self._paw_pins.index(pin)
-                print(f"Paw pin {index}:    {GPIO.input(pin)}")
-            if pin in spout_pins:
-                print(f"Spout {spout_pins.index(pin) + 1}: {GPIO.input(pin)}")
+        paw_index = {pin: i for i, pin in enumerate(self._paw_pins)}
+        spout_index = {pin: i for i, pin in enumerate(spout_pins)}
+
+        def _print_touch(pin, _input=GPIO.input):
+            if pin in paw_index:
+                print(f"Paw pin {paw_index[pin]}:    {_input(pin)}")
+            if pin in spout_index:
+                print(f"Spout {spout_index[pin] + 1}: {_input(pin)}")
 
         for pin in spout_pins:
             GPIO.add_event_detect(
@@ -7,6 +7,7 @@ mice. Iterating over a cohort returns its :class:`Mouse` instances.
 """
 
 from collections.abc import Sequence
+from itertools import chain
 
 from reach.mouse import Mouse
 
@@ -75,7 +76,7 @@ class Cohort(Sequence):
         This can easily be turned into a useful pandas DataFrame:
         >>> trials = pd.DataFrame(cohort.get_trials())
         """
-        return (i for mouse in self.mice for i in mouse.get_trials(collapse_days))
+        return chain.from_iterable(mouse.get_trials(collapse_days) for mouse in self.mice)
 
     def get_results(self, collapse_days: bool = True):
         """
@@ -84,7 +85,7 @@ class Cohort(Sequence):
         This can easily be turned into a useful pandas DataFrame:
         >>> results = pd.DataFrame(cohort.get_results())
         """
-        return (i for mouse in self.mice for i in mouse.get_results(collapse_days))
+        return chain.from_iterable(mouse.get_results(collapse_days) for mouse in self.mice)
 
     def get_spontaneous_reaches(self):
         """
@@ -93,4 +94,4 @@ class Cohort(Sequence):
         This can easily be turned into a useful pandas DataFrame:
         >>> spontaneous_reaches = pd.DataFrame(cohort.get_spontaneous_reaches())
         """
-        return (i for mouse in self.mice for i in mouse.get_spontaneous_reaches())
+        return chain.from_iterable(mouse.get_spontaneous_reaches() for mouse in self.mice)
@@ -7,11 +7,28 @@ experimental mouse. They are used to start training sessions using the
 :class:`Mouse.train()` method.
 """
 
-import json
-import tempfile
 from pathlib import Path
 
 from reach.session import Session
+from reach._json import write_json
+
+# Results that are added together when consecutive sessions are collapsed into one day
+_SUMMED_RESULTS = (
+    "trials",
+    "duration",
+    "resets",
+    "missed_l",
+    "missed_r",
+    "correct_l",
+    "correct_r",
+    "incorrect_l",
+    "incorrect_r",
+    "resets_l",
+    "resets_r",
+    "spontaneous_reaches_l",
+    "spontaneous_reaches_r",
+    "spontaneous_reaches",
+)
 
 
 class Mouse:
@@ -139,16 +156,20 @@ class Mouse:
         data_dir = Path(data_dir)
 
         def write(path):
-            with path.open(mode='w') as fd:
-                json.dump(data, fd)
+            write_json(path, data)
             print(f"Data was saved in {path}")
 
+        def write_to_tempdir():
+            # tempfile is slow to import and only needed when saving fails
+            import tempfile  # pylint: disable=import-outside-toplevel
+            write(Path(tempfile.gettempdir()) / f"{self.mouse_id}.json")
+
         try:
             write(data_dir / f"{self.mouse_id}.json")
         except FileNotFoundError:
-            write(Path(tempfile.gettempdir()) / f"{self.mouse_id}.json")
+            write_to_tempdir()
         except Exception as e:  # pylint: disable=broad-except
-            write(Path(tempfile.gettempdir()) / f"{self.mouse_id}.json")
+            write_to_tempdir()
             print(f"Exception raised while saving: {type(e)}")
             print("Please report this.")
 
@@ -215,27 +236,16 @@ class Mouse:
 
                 if collapse_days:
                     if date == session_results["date"]:
-                        results[-1]["trials"] += session_results["trials"]
-                        results[-1]["duration"] += session_results["duration"]
-                        results[-1]["resets"] += session_results["resets"]
-                        results[-1]["missed_l"] += session_results["missed_l"]
-                        results[-1]["missed_r"] += session_results["missed_r"]
-                        results[-1]["correct_l"] += session_results["correct_l"]
-                        results[-1]["correct_r"] += session_results["correct_r"]
-                        results[-1]["incorrect_l"] += session_results["incorrect_l"]
-                        results[-1]["incorrect_r"] += session_results["incorrect_r"]
-                        results[-1]["resets_l"] += session_results["resets_l"]
-                        results[-1]["resets_r"] += session_results["resets_r"]
-                        results[-1]["spontaneous_reaches_l"] += session_results["spontaneous_reaches_l"]
-                        results[-1]["spontaneous_reaches_r"] += session_results["spontaneous_reaches_r"]
-                        results[-1]["spontaneous_reaches"] += session_results["spontaneous_reaches"]
-                        results[-1]["end_time"] = session_results["end_time"]
-                        results[-1]["notes"] = "{} ... {}".format(
-                            results[-1]["notes"], session_results["notes"]
+                        previous = results[-1]
+                        for key in _SUMMED_RESULTS:
+                            previous[key] += session_results[key]
+                        previous["end_time"] = session_results["end_time"]
+                        previous["notes"] = "{} ... {}".format(
+                            previous["notes"], session_results["notes"]
                         )
                         # We cannot reconstruct d prime with just this information, as
                         # we not know which trials are correction trials.
-                        results[-1]["d_prime"] = None
+                        previous["d_prime"] = None
                         day_decrement += 1
                     else:
                         session_results["day"] = day - day_decrement
@@ -6,14 +6,14 @@ Sessions
 training sessions and record data.
 """
 
-import json
 import random
-import signal
+import threading
 import time
-from collections import deque
+from collections import Counter, deque
 from statistics import NormalDist
 
 import reach.backends
+from reach._json import read_json
 
 settings_fstring = """
 _________________________________
@@ -42,6 +42,18 @@ ITI resets:        {reset_count}
 # _____________________________ #
 """
 
+# inv_cdf does not depend on any state, so one standard normal distribution is shared
+_INV_CDF = NormalDist().inv_cdf
+
+trial_fstring = """_____________________________________
+# -- Starting trial #{trial_count} -- {elapsed:4.0f} s -- #"""
+
+
+def _ignore_message(msg):  # pylint: disable=unused-argument
+    """
+    Stands in for print when a session is run with verbose=False.
+    """
+
 
 class Outcomes:
     """
@@ -66,29 +78,103 @@ class SlidingTrialList(deque):
     """
     A list of fixed length self.WINDOW, the number of recent trials used to calculate
     adaptive task settings for upcoming trials.
+
+    The numbers of successful trials and of trials with any reach in the window are
+    kept up to date as trials are added and removed, so the rates are read without
+    scanning the window.
     """
+    __slots__ = ("_hits", "_touches")
     WINDOW = 15
 
     def __init__(self):
         deque.__init__(self, [], self.WINDOW)
+        self._hits = 0
+        self._touches = 0
+
+    def _count(self, trial, sign):
+        outcome = trial['outcome']
+        if outcome == Outcomes.CORRECT:
+            self._hits += sign
+            self._touches += sign
+        elif outcome == Outcomes.INCORRECT:
+            self._touches += sign
+
+    def _recount(self):
+        self._hits = 0
+        self._touches = 0
+        for trial in self:
+            self._count(trial, 1)
+
+    def append(self, x):
+        if len(self) == self.WINDOW:
+            self._count(self[0], -1)
+        deque.append(self, x)
+        self._count(x, 1)
+
+    def extend(self, iterable):
+        for trial in list(iterable):
+            self.append(trial)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    # The other mutators are not used during training, so they count the window again
+    def appendleft(self, x):
+        deque.appendleft(self, x)
+        self._recount()
+
+    def extendleft(self, iterable):
+        deque.extendleft(self, iterable)
+        self._recount()
+
+    def insert(self, i, x):
+        deque.insert(self, i, x)
+        self._recount()
+
+    def pop(self):
+        trial = deque.pop(self)
+        self._recount()
+        return trial
+
+    def popleft(self):
+        trial = deque.popleft(self)
+        self._recount()
+        return trial
+
+    def remove(self, value):
+        deque.remove(self, value)
+        self._recount()
+
+    def clear(self):
+        deque.clear(self)
+        self._recount()
+
+    def __setitem__(self, key, value):
+        deque.__setitem__(self, key, value)
+        self._recount()
+
+    def __delitem__(self, key):
+        deque.__delitem__(self, key)
+        self._recount()
+
+    def __imul__(self, other):
+        deque.__imul__(self, other)
+        self._recount()
+        return self
 
     def get_hit_rate(self):
         """
         Return the proportion of trials in the sliding window that were successful.
         """
-        num_hits = len([i for i in self if i['outcome'] == Outcomes.CORRECT])
-        return num_hits / self.WINDOW
+        return self._hits / self.WINDOW
 
     def get_touch_rate(self):
         """
         Return the proportion of trials in the sliding window that resulted in reaches,
         whether correct or incorrect.
         """
-        num_hits = 0
-        for i in self:
-            if i['outcome'] == Outcomes.CORRECT or i['outcome'] == Outcomes.INCORRECT:
-                num_hits += 1
-        return num_hits / self.WINDOW
+        return self._touches / self.WINDOW
 
 
 class Session:
@@ -102,6 +188,24 @@ class Session:
         training data.
 
     """
+    # Many sessions are loaded at once for analysis, so avoid a __dict__ per instance
+    __slots__ = (
+        "data",
+        "_recent_trials",
+        "_reward_count",
+        "_outcome",
+        "_current_spout",
+        "_backend",
+        "_message",
+        "_cue_duration",
+        "_spout_position",
+        "_advance_delay",
+        "_hook",
+        "_iti_event",
+        "_outcome_event",
+        "_ending",
+    )
+
     def __init__(self, data=None):
         self.data = data or {}
 
@@ -109,7 +213,6 @@ class Session:
         self._recent_trials = [SlidingTrialList(), SlidingTrialList()]
         self._reward_count = 0
         self._outcome = Outcomes.TBD
-        self._iti_broken = False
         self._current_spout = Targets.LEFT
         self._backend = None
         self._message = print
@@ -117,6 +220,9 @@ class Session:
         self._spout_position = [1, 1]
         self._advance_delay = 1
         self._hook = None
+        self._ending = False
+        self._iti_event = None
+        self._outcome_event = None
 
     @classmethod
     def init_all_from_file(cls, data_file):
@@ -135,10 +241,20 @@ class Session:
             List of :class:`Session` instances.
 
         """
-        with open(data_file, "r") as fd:
-            previous_data = json.load(fd)
+        return [cls(data=data) for data in read_json(data_file)]
 
-        return [cls(data=data) for data in previous_data]
+    @property
+    def reward_count(self):
+        """
+        The number of rewards given during this session. While a session is run this is
+        counted as trials complete; for sessions loaded from training data it is counted
+        from the recorded trial outcomes.
+        """
+        if self._backend is None:
+            return sum(
+                t.get("outcome") == Outcomes.CORRECT for t in self.data.get("trials", ())
+            )
+        return self._reward_count
 
     def add_data(self, data):
         """
@@ -162,6 +278,7 @@ class Session:
         timeout=None,
         initial_spout=None,
         advance_with_incorrects=False,
+        verbose=True,
     ):
         """
         Begin a training session.
@@ -197,6 +314,12 @@ class Session:
             happen as long as the mouse is touch any reach target consistently, rather
             than reaching only to the current target.
 
+        verbose : :class:`bool`, optional
+            If False, the session sends no messages until it has ended, including the
+            training settings and the progress of each trial. Messages printed by the
+            backend itself, such as while it waits for the mouse to rest, are still
+            shown. Default: True.
+
         """
         if not isinstance(backend, reach.backends.Backend):
             raise TypeError("Provided backend is not an instance of reach.backend.Backend")
@@ -204,7 +327,13 @@ class Session:
         self._backend = backend
         self._hook = hook
 
-        if hasattr(self._backend, "message"):
+        # These are set by the backend callbacks to wake the ITI and trial waits early
+        self._iti_event = threading.Event()
+        self._outcome_event = threading.Event()
+
+        if not verbose:
+            self._message = _ignore_message
+        elif hasattr(self._backend, "message"):
             self._message = self._backend.message
 
         self.data["duration"] = duration or 1800
@@ -252,6 +381,8 @@ class Session:
             self._message("Cancelled..")
             return
 
+        # signal is only needed when training, not when analysing loaded sessions
+        import signal  # pylint: disable=import-outside-toplevel
         signal.signal(signal.SIGINT, self._end_session)
         self._trial_loop()
         self._end_session()
@@ -277,28 +408,39 @@ class Session:
         Loop over the main event sequence forming the behavioural task.
         """
         data = self.data
-        now = time.time()
-        data["start_time"] = now
-        data["end_time"] = now + data["duration"]
+        data["start_time"] = time.time()
+        data["end_time"] = data["start_time"] + data["duration"]
         trial_count = 0
 
-        while now < data["end_time"]:
+        # The session deadline uses the monotonic clock so that it is unaffected by
+        # changes to the system time, e.g. from NTP. Wall-clock time is only stored.
+        monotonic = time.monotonic
+        start = now = monotonic()
+        end = start + data["duration"]
+
+        message = self._message
+        verbose = message is not _ignore_message
+        hook = self._hook
+        adapt_settings = self._adapt_settings
+        outcome_event = self._outcome_event
+        trial_banner = trial_fstring.format
+
+        while now < end:
             trial_count += 1
             self._outcome = Outcomes.TBD
-            self._message("_____________________________________")
-            self._message(
-                "# -- Starting trial #%i -- %4.0f s -- #"
-                % (trial_count, now - data["start_time"])
-            )
-            self._adapt_settings()
-            if self._hook is not None:
-                self._hook()
+            outcome_event.clear()
+            if verbose:
+                message(trial_banner(trial_count=trial_count, elapsed=now - start))
+            adapt_settings()
+            if hook is not None:
+                hook()
             if self._inter_trial_interval():
                 self._trial()
-                self._message(f"Total rewards: {self._reward_count}")
-                now = time.time()
+                if verbose:
+                    message(f"Total rewards: {self._reward_count}")
+                now = monotonic()
 
-            if self._outcome == Outcomes.CANCELLED:
+            if self._ending:
                 break
 
     def _adapt_settings(self):
@@ -306,14 +448,16 @@ class Session:
         Adapt live training settings based on recent behavioural performance.
         """
         self._advance_delay -= 1
+        if self._advance_delay > 0:
+            return
 
-        advance = False
+        recent_trials = self._recent_trials[self._current_spout]
         if self.data["advance_with_incorrects"]:
-            advance = self._recent_trials[self._current_spout].get_touch_rate() >= 0.90
+            advance = recent_trials.get_touch_rate() >= 0.90
         else:
-            advance = self._recent_trials[self._current_spout].get_hit_rate() >= 0.90
+            advance = recent_trials.get_hit_rate() >= 0.90
 
-        if advance and self._advance_delay <= 0:
+        if advance:
             self._advance_delay = 5
             other_spout = abs(self._current_spout - 1)
             if self._spout_position[self._current_spout] < 7:
@@ -344,72 +488,84 @@ class Session:
             the session.
 
         """
-        self._backend.start_iti()
-        self._iti_broken = True
-
-        while self._iti_broken:
-            if not self._backend.wait_for_rest():
-                return False
-            self._iti_broken = False
-
-            now = time.time()
-            iti_duration = random.uniform(*self.data["intertrial_interval"]) / 1000
-            iti_end = now + iti_duration
-            self._message(f"Counting down {iti_duration:.2f}s")
+        rand = random.random
+        iti_min, iti_max = (i / 1000 for i in self.data["intertrial_interval"])
+        iti_span = iti_max - iti_min
+        backend = self._backend
+        iti_event = self._iti_event
+        timeout_s = self.data["timeout"] / 1000
 
-            while now < iti_end and not self._iti_broken:
-                if self._outcome == Outcomes.CANCELLED:
-                    return False
-                time.sleep(0.020)
-                now = time.time()
+        backend.start_iti()
 
-            if self._iti_broken:
-                time.sleep(self.data["timeout"] / 1000)
+        while True:
+            if not backend.wait_for_rest():
+                return False
+            iti_event.clear()
+
+            iti_duration = iti_min + iti_span * rand()
+            if self._message is not _ignore_message:
+                self._message(f"Counting down {iti_duration:.2f}s")
+
+            # Wait out the ITI unless a callback breaks it by setting the event or the
+            # session ends. The ending check comes after the clear, which may have
+            # undone its wake-up.
+            iti_broken = False
+            if not self._ending:
+                iti_broken = iti_event.wait(iti_duration)
+            if self._ending:
+                return False
 
-        return True
+            if not iti_broken:
+                return True
+            time.sleep(timeout_s)
 
     def _trial(self):
         """
         Run trial during training session.
         """
+        backend = self._backend
+        message = self._message
+
         now = time.time()
-        self.data["trials"].append({"start": now})
+        trial = {"start": now}
+        self.data["trials"].append(trial)
 
-        self._backend.start_trial(self._current_spout)
+        backend.start_trial(self._current_spout)
 
         cue_duration = self._cue_duration / 1000
         cue_end = now + cue_duration
 
-        while not self._outcome and now < cue_end:
-            time.sleep(0.008)
-            now = time.time()
+        # Wait for the remainder of the cue unless an outcome is reached first
+        if not self._ending:
+            self._outcome_event.wait(cue_end - time.time())
+        outcome = self._outcome
 
-        if self._outcome == Outcomes.MISSED:
-            self._backend.end_trial()
-            self._backend.miss_trial()
-            self._message("Missed reach")
-            self.data["trials"][-1]["end"] = cue_end
+        if outcome == Outcomes.MISSED:
+            backend.end_trial()
+            backend.miss_trial()
+            message("Missed reach")
+            trial["end"] = cue_end
 
-        elif self._outcome == Outcomes.CORRECT:
-            self._message("Successful reach!")
+        elif outcome == Outcomes.CORRECT:
+            message("Successful reach!")
             self._reward_count += 1
 
-        elif self._outcome == Outcomes.INCORRECT:
-            self._message("Incorrect reach!")
+        elif outcome == Outcomes.INCORRECT:
+            message("Incorrect reach!")
             time.sleep(self.data["timeout"] / 1000)
 
-        elif self._outcome == Outcomes.CANCELLED:
+        elif outcome == Outcomes.CANCELLED:
             return
 
-        self.data["trials"][-1].update(
+        trial.update(
             dict(
                 spout=self._current_spout,
                 cue_duration=cue_duration * 1000,
-                outcome=self._outcome,
+                outcome=outcome,
                 spout_position=self._spout_position,
             )
         )
-        self._recent_trials[self._current_spout].append(self.data["trials"][-1])
+        self._recent_trials[self._current_spout].append(trial)
 
     def on_iti_lift(self, side):
         """
@@ -422,8 +578,8 @@ class Session:
             Which paw was lifted: 0 for left, 1 for right
 
         """
-        self._iti_broken = True
         self.data["resets"].append((time.time(), side))
+        self._iti_event.set()
 
     def on_iti_grasp(self, side):
         """
@@ -435,8 +591,8 @@ class Session:
             Which spout was grasped: 0 for left, 1 for right.
 
         """
-        self._iti_broken = True
         self.data["spontaneous_reaches"].append((time.time(), side))
+        self._iti_event.set()
         self._message("Spontaneous reach made!")
 
     def on_trial_lift(self, side):
@@ -449,9 +605,10 @@ class Session:
             Which spout side paw was lifted: 0 for left, 1 for right.
 
         """
-        if "lift_time" not in self.data["trials"][-1]:
-            self.data["trials"][-1]["lift_time"] = time.time()
-            self.data["trials"][-1]["lift_paw"] = side
+        trial = self.data["trials"][-1]
+        if "lift_time" not in trial:
+            trial["lift_time"] = time.time()
+            trial["lift_paw"] = side
 
     def on_trial_correct(self):
         """
@@ -460,6 +617,7 @@ class Session:
         self.data["trials"][-1]["end"] = time.time()
         self._backend.end_trial()
         self._outcome = Outcomes.CORRECT
+        self._outcome_event.set()
         self._backend.give_reward(self._current_spout)
 
     def on_trial_incorrect(self):
@@ -469,6 +627,7 @@ class Session:
         self.data["trials"][-1]["end"] = time.time()
         self._backend.end_trial()
         self._outcome = Outcomes.INCORRECT
+        self._outcome_event.set()
         self._backend.miss_trial()
 
     def _end_session(self, signal_number=None, frame=None):  # pylint: disable=W0613
@@ -486,18 +645,28 @@ class Session:
             Passed to function by signal.signal; ignored.
 
         """
-        if self._outcome == Outcomes.CANCELLED:
+        # This flag rather than the outcome marks the end, as the trial loop resets the
+        # outcome at the start of each trial and could otherwise clear it
+        if self._ending:
             return
+        self._ending = True
+        import signal  # pylint: disable=import-outside-toplevel
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
 
         self._message = print
         self._outcome = Outcomes.CANCELLED
+
+        # As the SIGINT handler this may interrupt the main thread while it holds one of
+        # the events' locks, so they are set from other threads to avoid a deadlock.
+        for event in (self._outcome_event, self._iti_event):
+            threading.Thread(target=event.set, daemon=True).start()
         self._backend.cleanup()
-        signal.signal(signal.SIGINT, signal.SIG_IGN)
 
         data = self.data
         data["end_time"] = time.time()
         data["duration"] = data["end_time"] - data["start_time"]
-        data["date"] = time.strftime("%Y-%m-%d")
+        # Derive the date from the recorded end time rather than reading the clock again
+        data["date"] = time.strftime("%Y-%m-%d", time.localtime(data["end_time"]))
 
     def set_spout(self, spout):
         """
@@ -557,31 +726,28 @@ class Session:
         values (Hautus, 1995).
 
         """
-        def z(p):
-            return - NormalDist().inv_cdf(p)
-
         # Trials preceded by an incorrect trial are considered to be correction trials,
-        # and are therefore ignored. Remove missed trials to help identify these.
-        trials = [
-            t for t in self.data['trials']
-            if t.get('outcome') in (Outcomes.CORRECT, Outcomes.INCORRECT)
-        ]
-
-        lefts = []
-        rights = []
+        # and are therefore ignored. Missed trials are skipped to help identify these.
+        lefts = left_hits = rights = right_false_alarms = 0
         prev = None
-        for trial in trials:
+        for trial in self.data['trials']:
             outcome = trial.get("outcome")
+            if outcome not in (Outcomes.CORRECT, Outcomes.INCORRECT):
+                continue
             if prev != Outcomes.INCORRECT:
                 if trial.get('spout') == Targets.LEFT:
-                    lefts.append(outcome)
+                    lefts += 1
+                    if outcome == Outcomes.CORRECT:
+                        left_hits += 1
                 else:
-                    rights.append(outcome)
+                    rights += 1
+                    if outcome == Outcomes.INCORRECT:
+                        right_false_alarms += 1
             prev = outcome
 
-        H = (lefts.count(Outcomes.CORRECT) + 0.5) / (len(lefts) + 1)
-        FA = (rights.count(Outcomes.INCORRECT) + 0.5) / (len(rights) + 1)
-        d_prime = z(FA) - z(H)
+        H = (left_hits + 0.5) / (lefts + 1)
+        FA = (right_false_alarms + 0.5) / (rights + 1)
+        d_prime = _INV_CDF(H) - _INV_CDF(FA)
         return d_prime
 
     def get_results(self):
@@ -599,25 +765,22 @@ class Session:
         trials = self.get_trials()
         if not trials:
             return None
-        outcomes_l = [i["outcome"] for i in trials if 'spout' in i and i['spout'] == Targets.LEFT]
-        outcomes_r = [i["outcome"] for i in trials if 'spout' in i and i['spout'] == Targets.RIGHT]
-        results["missed_l"] = outcomes_l.count(Outcomes.MISSED)  # pylint: disable=E1101
-        results["missed_r"] = outcomes_r.count(Outcomes.MISSED)  # pylint: disable=E1101
-        results["correct_l"] = outcomes_l.count(Outcomes.CORRECT)  # pylint: disable=E1101
-        results["correct_r"] = outcomes_r.count(Outcomes.CORRECT)  # pylint: disable=E1101
-        results["incorrect_l"] = outcomes_l.count(Outcomes.INCORRECT)  # pylint: disable=E1101
-        results["incorrect_r"] = outcomes_r.count(Outcomes.INCORRECT)  # pylint: disable=E1101
+        outcomes = Counter((i["spout"], i["outcome"]) for i in trials if 'spout' in i)
+        results["missed_l"] = outcomes[(Targets.LEFT, Outcomes.MISSED)]
+        results["missed_r"] = outcomes[(Targets.RIGHT, Outcomes.MISSED)]
+        results["correct_l"] = outcomes[(Targets.LEFT, Outcomes.CORRECT)]
+        results["correct_r"] = outcomes[(Targets.RIGHT, Outcomes.CORRECT)]
+        results["incorrect_l"] = outcomes[(Targets.LEFT, Outcomes.INCORRECT)]
+        results["incorrect_r"] = outcomes[(Targets.RIGHT, Outcomes.INCORRECT)]
         results["trials"] = len(trials)
+        resets = Counter(side for _, side in self.data["resets"])
         results["resets"] = len(self.data["resets"])
-        results["resets_l"] = len([x for x in self.data["resets"] if x[1] == Targets.LEFT])
-        results["resets_r"] = len([x for x in self.data["resets"] if x[1] == Targets.RIGHT])
+        results["resets_l"] = resets[Targets.LEFT]
+        results["resets_r"] = resets[Targets.RIGHT]
+        sponts = Counter(side for _, side in self.data["spontaneous_reaches"])
         results["spontaneous_reaches"] = len(self.data["spontaneous_reaches"])
-        results["spontaneous_reaches_l"] = len(
-            [x for x in self.data["spontaneous_reaches"] if x[1] == Targets.LEFT]
-        )
-        results["spontaneous_reaches_r"] = len(
-            [x for x in self.data["spontaneous_reaches"] if x[1] == Targets.RIGHT]
-        )
+        results["spontaneous_reaches_l"] = sponts[Targets.LEFT]
+        results["spontaneous_reaches_r"] = sponts[Targets.RIGHT]
         results["d_prime"] = self.get_d_prime()
         return results
 
@@ -649,12 +812,12 @@ def print_results(session):
         if not trials:
             return
 
-    outcomes = [i.get("outcome") for i in trials]
+    outcomes = Counter(i.get("outcome") for i in trials)
     trial_count = len(trials)
-    reward_count = outcomes.count(Outcomes.CORRECT)
-    incorrect_count = outcomes.count(Outcomes.INCORRECT)
-    miss_count = outcomes.count(Outcomes.MISSED)
-    reset_pins = [y for x, y in data["resets"]]
+    reward_count = outcomes[Outcomes.CORRECT]
+    incorrect_count = outcomes[Outcomes.INCORRECT]
+    miss_count = outcomes[Outcomes.MISSED]
+    resets = Counter(side for _, side in data["resets"])
 
     print(results_fstring.format(
         trial_count=trial_count,
@@ -667,6 +830,6 @@ def print_results(session):
         miss_perc=100 * miss_count / trial_count,
         spont_count=len(data['spontaneous_reaches']),
         reset_count=len(data['resets']),
-        left_resets=reset_pins.count(Targets.LEFT),
-        right_resets=reset_pins.count(Targets.RIGHT),
+        left_resets=resets[Targets.LEFT],
+        right_resets=resets[Targets.RIGHT],
     ))
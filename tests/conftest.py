@@ -37,13 +37,16 @@ class TestBackend(Backend):
      - cancelled
 
     We do 4 trials and end the session in the middle of the 4th. To imitate 10s of time
-    during a trial, we hijack time.time and increment the fake_now variable by 10000,
-    returning its new value each time. time.time is called once at the beginning, 4
-    times per trial, and once during any of the on_* Session methods. At certain
-    fake_now values we imitate events happening to the backend by executing session
-    callbacks, to test these. (This is ugly, I know).
+    during a trial, we hijack time.time and time.monotonic and increment the fake_now
+    variable by 10000, returning its new value each time. Together these are called
+    twice at the beginning, 3 times per trial, and once during any of the on_* Session
+    methods. At certain fake_now values we imitate events happening to the backend by
+    executing session callbacks, to test these. (This is ugly, I know).
 
     """
+    # Whether the session is expected to send messages to the backend
+    expect_messages = True
+
     def message(self, msg):
         assert isinstance(msg, str)
         self.messaged = True
@@ -78,7 +81,9 @@ class TestBackend(Backend):
                 fake_now -= 10000
             return fake_now
         self.time = time.time
+        self.monotonic = time.monotonic
         time.time = fake_time
+        time.monotonic = fake_time
 
     def wait_for_rest(self):
         self.session.on_iti_lift(0)  # contains 1 time.time
@@ -101,4 +106,5 @@ class TestBackend(Backend):
     def cleanup(self):
         time.sleep = self.sleep
         time.time = self.time
-        assert self.messaged
+        time.monotonic = self.monotonic
+        assert self.messaged == self.expect_messages
@@ -3,6 +3,7 @@
 Tests for reach.mouse
 """
 
+import math
 import os
 import tempfile
 
@@ -38,6 +39,9 @@ def test_train(mouse, backend):
     assert len(mouse[-1]._recent_trials) == 2
     assert len(mouse[-1]._recent_trials[0]) == reach.session.SlidingTrialList.WINDOW
     assert len(mouse[-1]._recent_trials[1]) == reach.session.SlidingTrialList.WINDOW
+    assert mouse[-1].reward_count == sum(
+        t.get('outcome') == reach.session.Outcomes.CORRECT for t in mouse[-1].data['trials']
+    )
 
 
 def test_save_data_to_file(mouse, mouse_id):
@@ -50,6 +54,25 @@ def test_save_data_to_file(mouse, mouse_id):
     os.remove(os.path.join(data_dir,  mouse_id + '.json'))
 
 
+@pytest.mark.parametrize('value', [float('nan'), float('inf')])
+def test_save_data_to_file_non_finite(mouse, mouse_id, tmp_path, value):
+    mouse[-1].data['value'] = value
+    mouse.save_data_to_file(tmp_path)
+    sessions = Session.init_all_from_file(tmp_path / f'{mouse_id}.json')
+    new_value = sessions[-1].data['value']
+    assert math.isnan(new_value) if math.isnan(value) else new_value == value
+
+
+@pytest.mark.parametrize('value', [2 ** 64 + 1, -2 ** 63 - 1])
+def test_save_data_to_file_large_integer(mouse, mouse_id, tmp_path, value):
+    mouse[-1].data['value'] = value
+    mouse.save_data_to_file(tmp_path)
+    sessions = Session.init_all_from_file(tmp_path / f'{mouse_id}.json')
+    new_value = sessions[-1].data['value']
+    assert isinstance(new_value, int)
+    assert new_value == value
+
+
 def test_get_trials(mouse):
     i = 1
     for t in mouse.get_trials():
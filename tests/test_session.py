@@ -3,6 +3,8 @@
 Tests for reach.session
 """
 
+import random
+
 import pytest
 
 from reach.session import (
@@ -37,9 +39,44 @@ def test_recent_trials(session):
         win = all_trials[side][-SlidingTrialList.WINDOW:]
         hit_rate = win.count(Outcomes.CORRECT) / SlidingTrialList.WINDOW
         assert recent_trials[side].get_hit_rate() == hit_rate
-
-
-def test_run(session, backend):
+        touches = win.count(Outcomes.CORRECT) + win.count(Outcomes.INCORRECT)
+        assert recent_trials[side].get_touch_rate() == touches / SlidingTrialList.WINDOW
+
+
+def test_recent_trials_mutators():
+    rng = random.Random(0)
+
+    def trial():
+        return {'outcome': rng.choice(
+            (Outcomes.MISSED, Outcomes.CORRECT, Outcomes.INCORRECT)
+        )}
+
+    recent_trials = SlidingTrialList()
+    recent_trials.extend(trial() for _ in range(SlidingTrialList.WINDOW))
+    mutations = (
+        lambda: recent_trials.append(trial()),
+        lambda: recent_trials.extend([trial(), trial()]),
+        lambda: recent_trials.appendleft(trial()),
+        lambda: recent_trials.extendleft([trial()]),
+        lambda: recent_trials.pop() if recent_trials else None,
+        lambda: recent_trials.popleft() if recent_trials else None,
+        lambda: recent_trials.__setitem__(0, trial()) if recent_trials else None,
+        lambda: recent_trials.__delitem__(-1) if recent_trials else None,
+        lambda: recent_trials.remove(recent_trials[0]) if recent_trials else None,
+        lambda: recent_trials.clear() if rng.random() < 0.05 else None,
+    )
+    for _ in range(1000):
+        rng.choice(mutations)()
+        outcomes = [i['outcome'] for i in recent_trials]
+        hit_rate = outcomes.count(Outcomes.CORRECT) / SlidingTrialList.WINDOW
+        assert recent_trials.get_hit_rate() == hit_rate
+        touches = outcomes.count(Outcomes.CORRECT) + outcomes.count(Outcomes.INCORRECT)
+        assert recent_trials.get_touch_rate() == touches / SlidingTrialList.WINDOW
+
+
+@pytest.mark.parametrize('verbose', [True, False])
+def test_run(session, backend, verbose):
+    backend.expect_messages = verbose
     hook_flag = 0
     def hook():
         nonlocal hook_flag
@@ -52,6 +89,7 @@ def test_run(session, backend):
         timeout=0,
         hook=hook,
         initial_spout=Targets.LEFT,
+        verbose=verbose,
     )
     assert hook_flag == 4
     results = session.get_results()
@@ -92,6 +130,11 @@ def test_get_results(session):
     assert results['spontaneous_reaches_r'] == 56
 
 
+def test_reward_count(session):
+    results = session.get_results()
+    assert session.reward_count == results['correct_l'] + results['correct_r']
+
+
 def test_get_spontaneous_reaches(session):
     sponts = session.get_spontaneous_reaches()
     locations = (Targets.LEFT, Targets.RIGHT)